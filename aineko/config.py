@@ -65,13 +65,31 @@ class DEFAULT_KAFKA_CONFIG(BaseConfig):
             BROKER_CONFIG[config] = value
 
     # Config for default kafka consumer
-    CONSUMER_CONFIG: Dict[str, str] = {
+    CONSUMER_CONFIG: Dict[str, Any] = {
         **BROKER_CONFIG,
         "auto.offset.reset": "earliest",
+        # Let the broker batch up to 64KB per fetch response, but never
+        # hold a fetch back for more than 100ms on a quiet topic
+        "fetch.min.bytes": 65536,
+        "fetch.wait.max.ms": 100,
+        # Datasets have a single partition by default, so this caps every
+        # fetch response. Raised from the 1MB librdkafka default so that a
+        # backlog is caught up with fewer, larger fetches.
+        "max.partition.fetch.bytes": 4194304,
     }
 
     # Config for default kafka producer
-    PRODUCER_CONFIG: Dict[str, str] = {**BROKER_CONFIG}
+    PRODUCER_CONFIG: Dict[str, Any] = {
+        **BROKER_CONFIG,
+        # Wait up to 10ms for messages to batch together before sending,
+        # twice the 5ms librdkafka default
+        "linger.ms": 10,
+        # Pinned to the librdkafka default, so that batches stay the same
+        # size across librdkafka versions
+        "batch.num.messages": 10000,
+        # JSON messages compress well, lz4 keeps the CPU cost low
+        "compression.type": "lz4",
+    }
 
     # Default dataset config
     DATASET_PARAMS = {
@@ -92,6 +110,8 @@ class DEFAULT_KAFKA_CONFIG(BaseConfig):
     # Default Kafka consumer settings
     # Timeout for kafka consumer polling (seconds)
     CONSUMER_TIMEOUT = 0
+    # Max number of messages to fetch in a single batch
+    CONSUMER_BATCH_SIZE = 500
     # Max number of messages to retreive when getting the last message
     CONSUMER_MAX_MESSAGES = 1000000
 
@@ -114,6 +134,9 @@ class AINEKO_CONFIG(BaseConfig):
     # Timeout in seconds for dataset creation
     DATASET_CREATION_TIMEOUT = 300
 
+    # Timeout in seconds for delivering pending dataset writes on shutdown
+    DATASET_FLUSH_TIMEOUT = 10
+
     DEFAULT_PIPELINE_CONFIG = os.path.abspath(
         os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "conf/pipeline.yml"
@@ -15,7 +15,7 @@ Example dataset configuration:
 """
 import abc
 from concurrent.futures import Future
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from typing import Any, Dict, Generic, List, MutableSequence, Optional, TypeVar
 
 from aineko.models.dataset_config_schema import DatasetConfig
 from aineko.utils.imports import import_from_string
@@ -98,7 +98,7 @@ class AbstractDataset(abc.ABC, Generic[T]):
     name: str
 
     _test: bool
-    _input_values: List[Dict]
+    _input_values: MutableSequence[Dict]
     _output_values: List[Dict]
 
     @abc.abstractmethod
@@ -159,7 +159,7 @@ class AbstractDataset(abc.ABC, Generic[T]):
             dataset = AbstractDataset.from_config("my_dataset", config)
             ```
         """
-        dataset_config = DatasetConfig(**dict(config))
+        dataset_config = DatasetConfig.model_validate(dict(config))
 
         class_obj = import_from_string(dataset_config.type, kind="class")
         class_instance = class_obj(name, dict(dataset_config), test=test)
@@ -199,6 +199,23 @@ class AbstractDataset(abc.ABC, Generic[T]):
         """
         raise NotImplementedError
 
+    def flush(self, *args: T, **kwargs: T) -> Any:
+        """Wait for pending writes to reach the storage layer.
+
+        Datasets that buffer writes should override this method. By default,
+        writes are assumed to be synchronous and nothing is done.
+        """
+        return None
+
+    def close(self, *args: T, **kwargs: T) -> Any:
+        """Release the query layer of the dataset.
+
+        Called when a node is done with the dataset. Datasets that hold
+        connections or other resources should override this method. By
+        default, nothing is done.
+        """
+        return None
+
     @abc.abstractmethod
     def setup_test_mode(
         self,
@@ -224,7 +241,7 @@ class AbstractDataset(abc.ABC, Generic[T]):
         """
         raise NotImplementedError
 
-    def get_test_input_values(self) -> List[Dict]:
+    def get_test_input_values(self) -> MutableSequence[Dict]:
         """Return the input values used for testing.
 
         Returns:
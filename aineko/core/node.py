@@ -272,8 +272,30 @@ class AbstractNode(ABC):
         self.log(f"Execution loop complete for node: {self.__class__.__name__}")
         self._post_loop_hook(params)
 
+        for input_dataset in self.inputs.values():
+            input_dataset.close()
+        self._flush_outputs()
+
+    def _flush_outputs(self) -> None:
+        """Waits for pending writes to the node outputs to be delivered.
+
+        Writes are delivered in the background, so they are flushed before
+        the node stops, as the pipeline may be taken down right after. All
+        outputs share a single `DATASET_FLUSH_TIMEOUT` deadline, so an
+        unreachable broker cannot block the shutdown, even when the outputs
+        share a producer that would otherwise be flushed once per output.
+        """
+        deadline = time.monotonic() + AINEKO_CONFIG.get("DATASET_FLUSH_TIMEOUT")
+        for output in self.outputs.values():
+            output.flush(timeout=max(deadline - time.monotonic(), 0))
+
     def activate_poison_pill(self) -> None:
-        """Activates poison pill, shutting down entire pipeline."""
+        """Activates poison pill, shutting down entire pipeline.
+
+        Pending writes to the node outputs are flushed first, so that they
+        are not lost when the pipeline is taken down.
+        """
+        self._flush_outputs()
         if self.poison_pill:
             ray.get(self.poison_pill.activate.remote())
 
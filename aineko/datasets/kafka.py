@@ -9,18 +9,36 @@ The storage layer for a Kafka dataset is a Kafka topic.
 The query layer for reading and writing to the topic
 is a Kafka consumer and producer, respectively.
 """
+import atexit
 import datetime
-import json
+import functools
 import logging
 import os
-from typing import Any, Dict, List, Literal, Optional, Union
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import orjson
 from confluent_kafka import (  # type: ignore
+    OFFSET_END,
     OFFSET_INVALID,
     Consumer,
     KafkaError,
+    KafkaException,
     Message,
     Producer,
+    TopicPartition,
 )
 from confluent_kafka.admin import AdminClient, NewTopic  # type: ignore
 from pydantic import BaseModel
@@ -34,6 +52,58 @@ from aineko.core.dataset import (
 
 logger = logging.getLogger(__name__)
 
+_ConsumerKey = Tuple[str, str, FrozenSet[Tuple[str, Any]]]
+
+# Consumers released by datasets, keyed by group id, topic and config.
+# Reusing a consumer avoids a new consumer group join and rebalance.
+_CONSUMER_CACHE: Dict[_ConsumerKey, Consumer] = {}
+
+
+@atexit.register
+def _close_pooled_consumers() -> None:
+    """Closes the pooled consumers so that they leave their consumer group."""
+    while _CONSUMER_CACHE:
+        _, consumer = _CONSUMER_CACHE.popitem()
+        consumer.close()
+
+
+# Producers shared by all datasets with the same producer config. Producers
+# are thread-safe and not bound to a topic, so a single producer per broker
+# can write to all datasets and batch their messages together.
+_PRODUCER_POOL: Dict[FrozenSet[Tuple[str, Any]], Producer] = {}
+
+
+def _flush_producer(producer: Producer, timeout: float) -> int:
+    """Flushes a producer, logging the messages it failed to deliver in time.
+
+    Args:
+        producer: producer to flush
+        timeout: maximum seconds to wait, -1 waits indefinitely
+
+    Returns:
+        number of messages still waiting to be delivered
+    """
+    remaining = producer.flush(timeout)
+    if remaining:
+        logger.warning(
+            "%s message(s) still undelivered after flushing for %ss.",
+            remaining,
+            timeout,
+        )
+    return remaining
+
+
+@atexit.register
+def _flush_pooled_producers() -> None:
+    """Delivers pending messages of the pooled producers before exiting."""
+    timeout = AINEKO_CONFIG.get("DATASET_FLUSH_TIMEOUT")
+    for producer in _PRODUCER_POOL.values():
+        _flush_producer(producer, timeout)
+
+
+# Valid values for the `how` argument of the read methods
+_VALID_HOW = frozenset(("next", "last"))
+
 
 class KafkaDatasetError(DatasetError):
     """General Exception for KafkaDataset errors."""
@@ -129,6 +199,8 @@ class KafkaDataset(AbstractDataset):
         _producer (Producer): Kafka producer
         _admin_client (AdminClient): Kafka AdminClient
         cached (bool): True if the consumer has been polled, False otherwise
+        _buffer (deque): raw messages fetched by the consumer in a batch
+            that have not been read yet
         location (str): location of the dataset
         consumer_name (str): name of the consumer
 
@@ -147,17 +219,26 @@ class KafkaDataset(AbstractDataset):
         self.topic_name = name
         self.params = params
         self.consumer_name: Optional[str] = None
-        self.credentials = KafkaCredentials(
-            **params.get("kafka_credentials", {})
+        self.credentials = KafkaCredentials.model_validate(
+            params.get("kafka_credentials", {})
         )
         self.cached = False
         self.source_node: str
         self.source_pipeline: str
         self._consumer: Consumer
+        self._consumer_key: Optional[_ConsumerKey] = None
         self._producer: Producer
+        self._buffer: Deque[Message] = deque()
+        self._json_prefix: bytes
+        self._produce: Callable[..., None]
+        self._timestamp_format = AINEKO_CONFIG.get("MSG_TIMESTAMP_FORMAT")
+        self._consumer_timeout = DEFAULT_KAFKA_CONFIG.get("CONSUMER_TIMEOUT")
+        self._consumer_batch_size = DEFAULT_KAFKA_CONFIG.get(
+            "CONSUMER_BATCH_SIZE"
+        )
         self._test = test
         self._empty = True
-        self._input_values: List[Dict] = []
+        self._input_values: Deque[Dict] = deque()
         self._output_values: List[Dict] = []
 
         if self._test is False:
@@ -193,6 +274,11 @@ class KafkaDataset(AbstractDataset):
         This method initializes a producer or consumer for the Kafka dataset,
         depending on the value of the `create` parameter.
 
+        The default consumer and producer configuration can be overridden per
+        dataset with the `consumer_config` and `producer_config` dataset
+        params, for example to tune batching with `fetch.min.bytes` or
+        `linger.ms`.
+
         Args:
             create: whether to create a consumer or producer for the dataset
             node_name: name of the node
@@ -204,6 +290,7 @@ class KafkaDataset(AbstractDataset):
             KafkaDatasetError: if an error occurs while creating the consumer
                 or producer
         """
+        dataset_params = self.params.get("params") or {}
         if create == "consumer":
             try:
                 self._create_consumer(
@@ -213,9 +300,10 @@ class KafkaDataset(AbstractDataset):
                         pipeline_name=pipeline_name,
                         prefix=prefix,
                         has_pipeline_prefix=has_pipeline_prefix,
-                        consumer_config=DEFAULT_KAFKA_CONFIG.get(
-                            "CONSUMER_CONFIG"
-                        ),
+                        consumer_config={
+                            **DEFAULT_KAFKA_CONFIG.get("CONSUMER_CONFIG"),
+                            **dataset_params.get("consumer_config", {}),
+                        },
                     )
                 )
                 logger.info("Consumer for %s created.", self.topic_name)
@@ -233,9 +321,10 @@ class KafkaDataset(AbstractDataset):
                         pipeline_name=pipeline_name,
                         prefix=prefix,
                         has_pipeline_prefix=has_pipeline_prefix,
-                        producer_config=DEFAULT_KAFKA_CONFIG.get(
-                            "PRODUCER_CONFIG"
-                        ),
+                        producer_config={
+                            **DEFAULT_KAFKA_CONFIG.get("PRODUCER_CONFIG"),
+                            **dataset_params.get("producer_config", {}),
+                        },
                     )
                 )
                 logger.info("Producer for %s created.", self.topic_name)
@@ -279,6 +368,12 @@ class KafkaDataset(AbstractDataset):
 
         Raises:
             ValueError: if how is not "next" or "last"
+
+        Note:
+            Reading with how="next" fetches messages in batches of up to
+            `CONSUMER_BATCH_SIZE`. The offset of a message is only stored
+            (and then auto-committed) once it is read, so fetched but unread
+            messages are read again after a restart.
         """
         if block:
             return self._consume_message(how=how, timeout=timeout)
@@ -299,69 +394,164 @@ class KafkaDataset(AbstractDataset):
         Raises:
             KafkaDatasetError: if an error occurs while reading the topic
         """
-        if how not in ["next", "last"]:
+        if how not in _VALID_HOW:
             raise ValueError(f"Invalid how: {how}. Expected `next` or `last`.")
 
         if self._test:
             if how == "next":
                 remaining = len(self._input_values)
                 if remaining > 0:
-                    return self._input_values.pop(0)
+                    return self._input_values.popleft()
 
             if how == "last":
                 if self._input_values:
                     return self._input_values[-1]
 
-        while True:
-            try:
-                message = self._consume(how=how, timeout=timeout)
+        # Recoverable errors, such as exceeding the max poll interval, are
+        # returned as None by `_consume` and simply polled again.
+        consume = self._consume
+        try:
+            while True:
+                message = consume(how=how, timeout=timeout)
                 if message is not None:
                     return message
-            except KafkaError as err:
-                if err.code() == "_MAX_POLL_EXCEEDED":
-                    continue
-                raise KafkaDatasetError(
-                    f"Error occurred while reading topic: {str(err)}"
-                ) from err
+        except KafkaException as err:
+            raise KafkaDatasetError(
+                f"Error occurred while reading topic: {str(err)}"
+            ) from err
 
-    def write(self, msg: Dict, key: Optional[str] = None) -> None:
+    def write(self, msg: Dict, key: Optional[Any] = None) -> None:
         """Produce a message to the dataset.
 
         Args:
             msg: message to produce to the dataset
-            key: key to use for the message
+            key: key to use for the message. Bytes are used as is, other
+                values are encoded from their string representation
 
         Raises:
             KafkaDatasetError: if an error occurs while writing to the topic
         """
         # Note, this will be re-written to use the dataset's schema,
         # without added metadata.
-        message = {
-            "timestamp": datetime.datetime.now().strftime(
-                AINEKO_CONFIG.get("MSG_TIMESTAMP_FORMAT")
-            ),
-            "dataset": self.name,
-            "source_pipeline": self.source_pipeline,
-            "source_node": self.source_node,
-            "message": msg,
-        }
-
         if self._test:
             if msg is not None:
-                self._output_values.append(message)
+                self._output_values.append(
+                    {
+                        "timestamp": datetime.datetime.now().strftime(
+                            self._timestamp_format
+                        ),
+                        "dataset": self.name,
+                        "source_pipeline": self.source_pipeline,
+                        "source_node": self.source_node,
+                        "message": msg,
+                    }
+                )
             return None
 
+        timestamp = datetime.datetime.now().strftime(self._timestamp_format)
+
         self._producer.poll(0)
 
-        key_bytes = str(key).encode("utf-8") if key is not None else None
+        key_bytes: Optional[bytes]
+        if key is None or isinstance(key, bytes):
+            key_bytes = key
+        elif isinstance(key, str):
+            key_bytes = key.encode("utf-8")
+        else:
+            key_bytes = str(key).encode("utf-8")
 
-        self._producer.produce(
-            topic=self.topic_name,
-            key=key_bytes,
-            value=json.dumps(message).encode("utf-8"),
-            callback=self._delivery_report,
-        )
-        self._producer.flush()
+        # Only the per-message fields are serialized, the metadata is
+        # prepended from the pre-serialized prefix.
+        try:
+            payload = orjson.dumps(
+                {"timestamp": timestamp, "message": msg},
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError as err:
+            # E.g. integers wider than 64 bits or unsupported types
+            raise KafkaDatasetError(
+                f"Error serializing message for {self.topic_name}: {str(err)}"
+            ) from err
+        self._produce(key=key_bytes, value=self._json_prefix + payload[1:])
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        """Wait for all messages written to the dataset to be delivered.
+
+        Messages are batched by the producer and delivered in the background,
+        so `write` returns before they reach the broker. The producer is
+        flushed automatically when the process exits. Producers are shared by
+        datasets with the same producer config, so this also waits for
+        messages written to those datasets.
+
+        Args:
+            timeout: maximum seconds to wait, -1 waits indefinitely.
+                Defaults to the `DATASET_FLUSH_TIMEOUT` aineko config.
+
+        Returns:
+            number of messages still waiting to be delivered, these are
+            logged as a warning
+        """
+        if self._test:
+            return 0
+        if timeout is None:
+            timeout = AINEKO_CONFIG.get("DATASET_FLUSH_TIMEOUT")
+        return _flush_producer(self._producer, timeout)
+
+    def close(self) -> None:
+        """Release the consumer of the dataset.
+
+        The consumer is not closed, but returned to a pool so that the next
+        dataset created for the same topic and consumer group reuses it
+        instead of joining the consumer group again. The consumer is first
+        rewound to the messages that were fetched but not read yet, so that
+        they are read by the next dataset using it. Pooled consumers are
+        closed when the process exits.
+
+        Only the offsets of messages that were read are stored, so closing
+        a consumer never commits past unread buffered messages.
+        """
+        if self._consumer_key is None:
+            return
+        consumer = self._consumer
+        pooled = _CONSUMER_CACHE.setdefault(self._consumer_key, consumer)
+        if pooled is consumer:
+            self._rewind_buffer()
+        else:
+            # Another consumer was already released for the same key. The
+            # committed offsets stop at the last read message, so the unread
+            # buffered messages are left to the consumer group.
+            self._buffer.clear()
+            consumer.close()
+        self._consumer_key = None
+
+    def _rewind_buffer(self) -> None:
+        """Seeks the consumer back to the first unread buffered messages.
+
+        The consumer position has already moved past buffered messages, so
+        each partition is rewound to its first buffered message before the
+        buffer is discarded.
+        """
+        first_offsets: Dict[Tuple[str, int], int] = {}
+        for message in self._buffer:
+            if message.error():
+                continue
+            first_offsets.setdefault(
+                (message.topic(), message.partition()), message.offset()
+            )
+        self._buffer.clear()
+
+        for (topic, partition), offset in first_offsets.items():
+            try:
+                self._consumer.seek(TopicPartition(topic, partition, offset))
+            except KafkaException as err:
+                logger.error(
+                    "Error rewinding consumer %s on %s [%d] to offset %d: %s",
+                    self.consumer_name,
+                    topic,
+                    partition,
+                    offset,
+                    err,
+                )
 
     def exists(self) -> bool:
         """Check if the dataset exists.
@@ -396,11 +586,31 @@ class KafkaDataset(AbstractDataset):
             self._consumer.poll(timeout=0)
             partitions = self._consumer.assignment()
 
-        for partition in partitions:
-            high_offset = self._consumer.get_watermark_offsets(
-                partition, cached=self.cached
-            )[1]
-
+        if self.cached:
+            # Watermarks are cached from previous fetch responses
+            high_offsets = [
+                self._consumer.get_watermark_offsets(partition, cached=True)[1]
+                for partition in partitions
+            ]
+        else:
+            # Query all partitions in a single request instead of one request
+            # per partition. OFFSET_END as timestamp resolves to the high offset.
+            latest_offsets = self._consumer.offsets_for_times(
+                [
+                    TopicPartition(
+                        partition.topic, partition.partition, OFFSET_END
+                    )
+                    for partition in partitions
+                ]
+            )
+            high_offsets = [
+                OFFSET_INVALID
+                if latest.error or latest.offset < 0
+                else latest.offset
+                for latest in latest_offsets
+            ]
+
+        for partition, high_offset in zip(partitions, high_offsets):
             # Invalid high offset can be caused by various reasons,
             # including rebalancing and empty topic. Default to -1.
             if high_offset == OFFSET_INVALID:
@@ -438,14 +648,14 @@ class KafkaDataset(AbstractDataset):
         Raises:
             ValueError: if how is not "next" or "last"
         """
-        if how not in ["next", "last"]:
+        if how not in _VALID_HOW:
             raise ValueError(f"Invalid how: {how}. Expected `next` or `last`.")
 
         if self._test:
             if how == "next":
                 remaining = len(self._input_values)
                 if remaining > 0:
-                    return self._input_values.pop(0)
+                    return self._input_values.popleft()
 
             if how == "last":
                 if self._input_values:
@@ -453,27 +663,159 @@ class KafkaDataset(AbstractDataset):
 
             return None
 
-        timeout = timeout or DEFAULT_KAFKA_CONFIG.get("CONSUMER_TIMEOUT")
         if how == "next":
-            # next unread message from queue
-            message = self._consumer.poll(timeout=timeout)
+            # next unread message from queue, fetched in batches to avoid
+            # a roundtrip to the consumer for every message. Messages are
+            # only decoded when read, so messages skipped by a later
+            # how="last" read are never decoded.
+            buffer = self._buffer
+            if not buffer:
+                buffer.extend(self._fetch_batch(timeout=timeout))
+            validate_message = self._validate_message
+            while buffer:
+                raw_message = buffer.popleft()
+                message = validate_message(raw_message)
+                if message is not None:
+                    self._store_offsets((raw_message,))
+                    return message
+            return None
 
+        timeout = timeout if timeout is not None else self._consumer_timeout
         if how == "last":
-            # last message from queue
+            # last message from queue, buffered messages are now stale
+            self._buffer.clear()
             try:
                 self._update_offset_to_latest()
-            except KafkaError as err:
+            except KafkaException as err:
                 logger.error(
                     "Error updating offset to latest for consumer %s: %s",
                     self.consumer_name,
                     err,
                 )
                 return None
-            message = self._consumer.poll(timeout=timeout)
+            raw_message = self._consumer.poll(timeout=timeout)
 
         self.cached = True
 
-        return self._validate_message(message)
+        message = self._validate_message(raw_message)
+        if message is not None:
+            self._store_offsets((raw_message,))
+        return message
+
+    def consume_batch(
+        self,
+        num_messages: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """Consumes a batch of messages from the dataset.
+
+        Messages already fetched by a previous read are returned first, the
+        rest is fetched with a single call to the consumer, which is
+        considerably cheaper than polling the messages one by one. Returns as
+        soon as any message is available, without waiting for the batch to
+        fill up.
+
+        The offsets of the returned messages are stored (and then
+        auto-committed) by the time this returns, see `read`.
+
+        Args:
+            num_messages: maximum number of messages to consume. Defaults to
+                `CONSUMER_BATCH_SIZE` in the Kafka config.
+            timeout: seconds to wait for a message if none is available.
+
+        Returns:
+            list of valid messages from the dataset, possibly empty
+        """
+        num_messages = num_messages or self._consumer_batch_size
+        if self._test:
+            num_messages = min(num_messages, len(self._input_values))
+            return [self._input_values.popleft() for _ in range(num_messages)]
+
+        buffer = self._buffer
+        messages = [
+            buffer.popleft() for _ in range(min(num_messages, len(buffer)))
+        ]
+        if len(messages) < num_messages:
+            messages.extend(
+                self._fetch_batch(
+                    num_messages=num_messages - len(messages),
+                    # Only wait for new messages if none were buffered
+                    timeout=0 if messages else timeout,
+                )
+            )
+
+        valid_messages = [
+            message
+            for message in map(self._validate_message, messages)
+            if message is not None
+        ]
+        self._store_offsets(messages)
+        return valid_messages
+
+    def _store_offsets(self, messages: Iterable[Message]) -> None:
+        """Stores the offsets of messages that were handed out.
+
+        Automatic offset storing is disabled for the consumer, since it
+        would store the offsets of buffered messages that were fetched but
+        not read yet. The stored offsets are auto-committed by the consumer.
+
+        Args:
+            messages: raw messages that were read, in consumption order
+        """
+        next_offsets: Dict[Tuple[str, int], int] = {}
+        for message in messages:
+            if not message.error():
+                next_offsets[(message.topic(), message.partition())] = (
+                    message.offset() + 1
+                )
+        if not next_offsets:
+            return
+        try:
+            self._consumer.store_offsets(
+                offsets=[
+                    TopicPartition(topic, partition, offset)
+                    for (topic, partition), offset in next_offsets.items()
+                ]
+            )
+        except KafkaException as err:
+            # E.g. the partition was revoked, the message is read again
+            logger.error(
+                "Error storing offsets for consumer %s: %s",
+                self.consumer_name,
+                err,
+            )
+
+    def _fetch_batch(
+        self,
+        num_messages: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Message]:
+        """Fetches a batch of raw messages from the consumer.
+
+        Takes the messages the consumer has already received without
+        blocking. Only if there are none, waits for a single message, so
+        that the call returns as soon as a message arrives instead of
+        waiting for a full batch.
+
+        Args:
+            num_messages: maximum number of messages to fetch. Defaults to
+                `CONSUMER_BATCH_SIZE` in the Kafka config.
+            timeout: seconds to wait for a message if none is available.
+
+        Returns:
+            list of raw messages, possibly empty
+        """
+        timeout = timeout if timeout is not None else self._consumer_timeout
+        messages = self._consumer.consume(
+            num_messages=num_messages or self._consumer_batch_size,
+            timeout=0,
+        )
+        if not messages and timeout != 0:
+            message = self._consumer.poll(timeout=timeout)
+            if message is not None:
+                messages = [message]
+        self.cached = True
+        return messages
 
     @staticmethod
     def _validate_message(
@@ -485,22 +827,46 @@ class KafkaDataset(AbstractDataset):
             message: message to check
 
         Returns:
-            message if valid, None if not
+            message if valid, None if not (including payloads that are not
+            valid JSON, which are logged and skipped)
+
+        Raises:
+            KafkaDatasetError: if the message carries a fatal consumer error
         """
         # Check if message is valid
-        if message is None or message.value() is None:
+        if message is None:
             return None
 
         # Check if message is an error
-        if message.error():
-            logger.error(str(message.error()))
+        error = message.error()
+        if error:
+            if error.code() == KafkaError._MAX_POLL_EXCEEDED:
+                # Consumer rejoins the group on the next poll
+                return None
+            if error.fatal():
+                raise KafkaDatasetError(
+                    f"Fatal error occurred while reading topic: {str(error)}"
+                )
+            logger.error(str(error))
+            return None
+
+        value = message.value()
+        if value is None:
             return None
 
-        # Convert message to dict
-        message = message.value()
-        if isinstance(message, bytes):
-            message = message.decode("utf-8")
-        return json.loads(message)
+        # Convert message bytes to dict, without decoding to str first
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError as err:
+            # orjson is stricter than json, e.g. NaN/Infinity are rejected
+            logger.error(
+                "Skipping undecodable message at %s[%s]@%s: %s",
+                message.topic(),
+                message.partition(),
+                message.offset(),
+                err,
+            )
+            return None
 
     def next(self) -> Dict:
         """Consumes the next message from the dataset.
@@ -560,14 +926,17 @@ class KafkaDataset(AbstractDataset):
         Returns:
             list of messages from the dataset
         """
-        messages = []
+        messages: List[Dict] = []
+        # Bind methods once, outside of the loop
+        consume = self._consume
+        append = messages.append
         while True:
-            message = self._consume()
+            message = consume()
             if message is None:
                 continue
             if message["message"] == end_message:
                 break
-            messages.append(message)
+            append(message)
         return messages
 
     # Create methods
@@ -591,6 +960,28 @@ class KafkaDataset(AbstractDataset):
                 f"Error creating Kafka AdminClient: {str(err)}"
             ) from err
 
+    @staticmethod
+    def _build_topic_name(
+        dataset_name: str,
+        pipeline_name: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> str:
+        """Builds the name of the Kafka topic for a dataset.
+
+        Topic names have the form `<prefix>.<pipeline_name>.<dataset_name>`,
+        where the prefix and pipeline name are omitted if not given.
+
+        Args:
+            dataset_name: name of the dataset
+            pipeline_name: name of the pipeline, if the topic has a pipeline
+                prefix
+            prefix: prefix for the topic name
+
+        Returns:
+            name of the Kafka topic
+        """
+        return ".".join(filter(None, (prefix, pipeline_name, dataset_name)))
+
     def _create_consumer(self, consumer_params: ConsumerParams) -> None:
         """Creates Kafka Consumer and subscribes to the dataset topic.
 
@@ -606,22 +997,31 @@ class KafkaDataset(AbstractDataset):
         has_pipeline_prefix = consumer_params.has_pipeline_prefix
         consumer_config = consumer_params.consumer_config
 
-        self.topic_name = (
-            f"{pipeline_name}.{dataset_name}"
-            if has_pipeline_prefix
-            else dataset_name
+        topic_pipeline_name = pipeline_name if has_pipeline_prefix else None
+        self.topic_name = self._build_topic_name(
+            dataset_name, pipeline_name=topic_pipeline_name
+        )
+        consumer_topic = self._build_topic_name(
+            dataset_name, pipeline_name=topic_pipeline_name, prefix=prefix
+        )
+        self.consumer_name = ".".join(
+            filter(None, (prefix, pipeline_name, node_name))
         )
-
-        if prefix:
-            self.consumer_name = f"{prefix}.{pipeline_name}.{node_name}"
-            consumer_topic = f"{prefix}.{self.topic_name}"
-        else:
-            self.consumer_name = f"{pipeline_name}.{node_name}"
-            consumer_topic = self.topic_name
 
         consumer_config["group.id"] = self.consumer_name
-        self._consumer = Consumer(consumer_config)
-        self._consumer.subscribe([consumer_topic])
+        # Offsets are stored explicitly when messages are read, see
+        # `_store_offsets`
+        consumer_config["enable.auto.offset.store"] = False
+        self._consumer_key = (
+            self.consumer_name,
+            consumer_topic,
+            frozenset(consumer_config.items()),
+        )
+        consumer = _CONSUMER_CACHE.pop(self._consumer_key, None)
+        if consumer is None:
+            consumer = Consumer(consumer_config)
+            consumer.subscribe([consumer_topic])
+        self._consumer = consumer
 
     def _create_producer(self, producer_params: ProducerParams) -> None:
         """Creates Kafka Producer.
@@ -636,18 +1036,40 @@ class KafkaDataset(AbstractDataset):
         pipeline_name = producer_params.pipeline_name
         dataset_name = producer_params.dataset_name
         prefix = producer_params.prefix
-        # create topic name here:
-        topic_name = dataset_name
         self.source_node = node_name
         self.source_pipeline = pipeline_name
-        if has_pipeline_prefix:
-            topic_name = f"{pipeline_name}.{topic_name}"
-        if prefix:
-            topic_name = f"{prefix}.{topic_name}"
-        self.topic_name = topic_name
+        self.topic_name = self._build_topic_name(
+            dataset_name,
+            pipeline_name=pipeline_name if has_pipeline_prefix else None,
+            prefix=prefix,
+        )
+        # Message metadata is the same for every message written by the
+        # producer, so it is serialized once as the start of a JSON object.
+        self._json_prefix = (
+            orjson.dumps(
+                {
+                    "dataset": self.name,
+                    "source_pipeline": self.source_pipeline,
+                    "source_node": self.source_node,
+                }
+            )[:-1]
+            + b","
+        )
         producer_config = producer_params.producer_config
-        self._producer = Producer(
-            **producer_config,
+        producer_key = frozenset(producer_config.items())
+        producer = _PRODUCER_POOL.get(producer_key)
+        if producer is None:
+            producer = Producer(
+                **producer_config,
+            )
+            _PRODUCER_POOL[producer_key] = producer
+        self._producer = producer
+        # Topic and delivery callback are the same for every message, bind
+        # them to the producer once instead of passing them on every write.
+        self._produce = functools.partial(
+            self._producer.produce,
+            self.topic_name,
+            callback=self._delivery_report,
         )
 
     def _create_topic(
@@ -670,10 +1092,7 @@ class KafkaDataset(AbstractDataset):
         }
 
         # Configure dataset
-        if dataset_prefix:
-            topic_name = f"{dataset_prefix}.{dataset_name}"
-        else:
-            topic_name = dataset_name
+        topic_name = self._build_topic_name(dataset_name, prefix=dataset_prefix)
 
         new_dataset = NewTopic(
             topic=topic_name,
@@ -751,14 +1170,14 @@ class KafkaDataset(AbstractDataset):
         self.source_node = source_node
         self.source_pipeline = source_pipeline
         if input_values is not None:
-            for input_value in input_values.copy():
-                self._input_values.append(
-                    {
-                        "timestamp": datetime.datetime.now().strftime(
-                            AINEKO_CONFIG.get("MSG_TIMESTAMP_FORMAT")
-                        ),
-                        "message": input_value,
-                        "source_node": self.source_node,
-                        "source_pipeline": self.source_pipeline,
-                    }
-                )
+            self._input_values.extend(
+                {
+                    "timestamp": datetime.datetime.now().strftime(
+                        self._timestamp_format
+                    ),
+                    "message": input_value,
+                    "source_node": self.source_node,
+                    "source_pipeline": self.source_pipeline,
+                }
+                for input_value in input_values
+            )
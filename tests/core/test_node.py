@@ -135,3 +135,51 @@ def test_output_yielding_no_output(
                 message_helper(input["integer_sequence"])
                 == node_instance.cur_integer
             )
+
+
+def test_execute_flushes_outputs(dummy_node, monkeypatch) -> None:
+    """Tests that execute flushes the node outputs when it completes."""
+    node = dummy_node("test", "testing_pipeline", test=True, poison_pill=None)
+    node.setup_test(
+        dataset_type="aineko.datasets.kafka.KafkaDataset",
+        inputs={"input": [1, 2, 3]},
+        outputs=["output"],
+    )
+    flushed = []
+    for name, output in node.outputs.items():
+        monkeypatch.setattr(
+            output,
+            "flush",
+            lambda timeout, name=name: flushed.append((name, timeout)),
+        )
+
+    node.execute()
+
+    assert sorted(name for name, _ in flushed) == ["logging", "output"]
+    # Outputs share a single flush deadline
+    assert all(0 <= timeout <= 10 for _, timeout in flushed)
+
+
+def test_flush_outputs_deadline(dummy_node, monkeypatch) -> None:
+    """Tests that slow flushes use up the shared flush deadline."""
+    node = dummy_node("test", "testing_pipeline", test=True, poison_pill=None)
+    node.setup_test(
+        dataset_type="aineko.datasets.kafka.KafkaDataset",
+        inputs=None,
+        outputs=["output"],
+    )
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    timeouts = []
+
+    def slow_flush(timeout):
+        # Simulates an unreachable broker, the flush waits until timeout
+        timeouts.append(timeout)
+        now[0] += timeout
+
+    for output in node.outputs.values():
+        monkeypatch.setattr(output, "flush", slow_flush)
+
+    node._flush_outputs()
+
+    assert timeouts == [10, 0]
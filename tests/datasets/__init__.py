@@ -0,0 +1,2 @@
+# Copyright 2023 Aineko Authors
+# SPDX-License-Identifier: Apache-2.0
@@ -0,0 +1,243 @@
+# Copyright 2023 Aineko Authors
+# SPDX-License-Identifier: Apache-2.0
+"""Test fixtures for datasets.
+
+Fakes stand in for the confluent_kafka clients, so that the KafkaDataset
+can be tested without a running broker.
+"""
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import pytest
+
+from aineko.datasets import kafka
+
+
+class FakeKafkaError:
+    """Stand-in for confluent_kafka.KafkaError."""
+
+    def __init__(self, code: int, fatal: bool = False):
+        self._code = code
+        self._fatal = fatal
+
+    def code(self) -> int:
+        return self._code
+
+    def fatal(self) -> bool:
+        return self._fatal
+
+    def __str__(self) -> str:
+        return f"FakeKafkaError(code={self._code})"
+
+
+class FakeMessage:
+    """Stand-in for confluent_kafka.Message."""
+
+    def __init__(
+        self,
+        value: Optional[bytes] = None,
+        offset: int = 0,
+        error: Optional[FakeKafkaError] = None,
+        topic: str = "test_dataset",
+        partition: int = 0,
+    ):
+        self._value = value
+        self._offset = offset
+        self._error = error
+        self._topic = topic
+        self._partition = partition
+
+    def value(self) -> Optional[bytes]:
+        return self._value
+
+    def offset(self) -> int:
+        return self._offset
+
+    def error(self) -> Optional[FakeKafkaError]:
+        return self._error
+
+    def topic(self) -> str:
+        return self._topic
+
+    def partition(self) -> int:
+        return self._partition
+
+
+class FakeConsumer:
+    """Stand-in for confluent_kafka.Consumer serving queued messages."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.queue: deque = deque()
+        self.consume_calls: List[Dict[str, Any]] = []
+        self.poll_calls: List[Optional[float]] = []
+        self.seeks: List[Any] = []
+        self.stored: Dict[Tuple[str, int], int] = {}
+        self.closed = False
+        # Partitions assigned to the consumer, with their high offsets as
+        # returned by the broker, or None if the broker returns an error
+        self.partitions: List[Any] = []
+        self.latest_offsets: Dict[Tuple[str, int], Optional[int]] = {}
+        self.watermarks: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        self.offsets_for_times_calls: List[List[Tuple[str, int, int]]] = []
+        self.watermark_calls: List[bool] = []
+        self.assigned: List[Tuple[str, int, int]] = []
+
+    def subscribe(self, topics: List[str]) -> None:
+        self.topics = topics
+
+    def consume(self, num_messages: int = 1, timeout: float = -1) -> list:
+        self.consume_calls.append(
+            {"num_messages": num_messages, "timeout": timeout}
+        )
+        return [
+            self.queue.popleft()
+            for _ in range(min(num_messages, len(self.queue)))
+        ]
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[FakeMessage]:
+        self.poll_calls.append(timeout)
+        return self.queue.popleft() if self.queue else None
+
+    def store_offsets(
+        self, message: Any = None, offsets: Optional[List[Any]] = None
+    ) -> None:
+        for partition in offsets or []:
+            self.stored[
+                (partition.topic, partition.partition)
+            ] = partition.offset
+
+    def assignment(self) -> List[Any]:
+        return list(self.partitions)
+
+    def assign(self, partitions: List[Any]) -> None:
+        self.assigned = [
+            (partition.topic, partition.partition, partition.offset)
+            for partition in partitions
+        ]
+
+    def offsets_for_times(
+        self, partitions: List[Any], timeout: float = -1
+    ) -> List[SimpleNamespace]:
+        self.offsets_for_times_calls.append(
+            [
+                (partition.topic, partition.partition, partition.offset)
+                for partition in partitions
+            ]
+        )
+        results = []
+        for partition in partitions:
+            offset = self.latest_offsets[(partition.topic, partition.partition)]
+            results.append(
+                SimpleNamespace(
+                    topic=partition.topic,
+                    partition=partition.partition,
+                    offset=-1 if offset is None else offset,
+                    error=FakeKafkaError(-1) if offset is None else None,
+                )
+            )
+        return results
+
+    def get_watermark_offsets(
+        self, partition: Any, cached: bool = False
+    ) -> Tuple[int, int]:
+        self.watermark_calls.append(cached)
+        return self.watermarks[(partition.topic, partition.partition)]
+
+    def seek(self, partition: Any) -> None:
+        self.seeks.append(partition)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeProducer:
+    """Stand-in for confluent_kafka.Producer recording produced messages."""
+
+    def __init__(self, **config: Any):
+        self.config = config
+        self.produced: List[Dict[str, Any]] = []
+
+    def produce(
+        self,
+        topic: str,
+        value: Optional[bytes] = None,
+        key: Optional[bytes] = None,
+        callback: Any = None,
+    ) -> None:
+        self.produced.append({"topic": topic, "key": key, "value": value})
+
+    def poll(self, timeout: float = -1) -> int:
+        return 0
+
+    def flush(self, timeout: float = -1) -> int:
+        return 0
+
+
+@pytest.fixture
+def fake_kafka_error():
+    """Fixture providing the fake KafkaError class."""
+    return FakeKafkaError
+
+
+@pytest.fixture
+def fake_message():
+    """Fixture providing the fake Message class."""
+    return FakeMessage
+
+
+@pytest.fixture
+def message_factory():
+    """Fixture to build fake Kafka messages from message payloads."""
+
+    def _message_factory(
+        messages: List[Any], start_offset: int = 0
+    ) -> List[FakeMessage]:
+        return [
+            FakeMessage(
+                value=orjson.dumps({"message": message}),
+                offset=offset,
+            )
+            for offset, message in enumerate(messages, start=start_offset)
+        ]
+
+    return _message_factory
+
+
+@pytest.fixture
+def fake_kafka(monkeypatch):
+    """Replaces the Kafka clients with fakes and empties the client pools."""
+    monkeypatch.setattr(kafka, "AdminClient", lambda config: None)
+    monkeypatch.setattr(kafka, "Consumer", FakeConsumer)
+    monkeypatch.setattr(kafka, "Producer", FakeProducer)
+    monkeypatch.setattr(kafka, "_CONSUMER_CACHE", {})
+    monkeypatch.setattr(kafka, "_PRODUCER_POOL", {})
+
+
+@pytest.fixture
+def kafka_dataset(fake_kafka):
+    """Fixture to create KafkaDatasets backed by fake Kafka clients."""
+
+    def _kafka_dataset(
+        create: str,
+        name: str = "test_dataset",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> kafka.KafkaDataset:
+        dataset = kafka.KafkaDataset(
+            name,
+            {
+                "type": "aineko.datasets.kafka.KafkaDataset",
+                "location": "localhost:9092",
+                "params": params,
+            },
+        )
+        dataset.initialize(
+            create=create,
+            node_name="test_node",
+            pipeline_name="test_pipeline",
+        )
+        return dataset
+
+    return _kafka_dataset
@@ -0,0 +1,272 @@
+# Copyright 2023 Aineko Authors
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests for the KafkaDataset, using fake Kafka clients."""
+import json
+
+import orjson
+import pytest
+from confluent_kafka import (  # type: ignore
+    OFFSET_END,
+    KafkaError,
+    TopicPartition,
+)
+
+from aineko.datasets.kafka import KafkaDataset, KafkaDatasetError
+
+
+def test_consume_batch_test_mode(message_helper) -> None:
+    """Tests consume_batch on a dataset in test mode."""
+    dataset = KafkaDataset("test_dataset", {}, test=True)
+    dataset.setup_test_mode(
+        source_node="test_node",
+        source_pipeline="test_pipeline",
+        input_values=[1, 2, 3],
+    )
+
+    assert message_helper(dataset.consume_batch(2)) == [1, 2]
+    assert message_helper(dataset.consume_batch()) == [3]
+    assert dataset.consume_batch() == []
+
+
+def test_consume_batch(kafka_dataset, message_factory, subtests) -> None:
+    """Tests consume_batch with the messages buffered by read."""
+    dataset = kafka_dataset("consumer")
+    consumer = dataset._consumer
+    consumer.queue.extend(message_factory(range(5)))
+
+    with subtests.test("Check that the consumer does not store offsets."):
+        assert consumer.config["enable.auto.offset.store"] is False
+
+    with subtests.test("Check that read buffers the fetched batch."):
+        assert dataset.read("next")["message"] == 0
+        assert len(consumer.queue) == 0
+        assert len(dataset._buffer) == 4
+
+    with subtests.test("Check that only the read offset is stored."):
+        assert consumer.stored == {("test_dataset", 0): 1}
+
+    consumer.queue.extend(message_factory([5, 6], start_offset=5))
+
+    with subtests.test("Check that buffered messages are served first."):
+        assert [m["message"] for m in dataset.consume_batch(2)] == [1, 2]
+        # Buffer filled the batch, the consumer is not called
+        assert len(consumer.consume_calls) == 1
+        assert consumer.stored == {("test_dataset", 0): 3}
+
+    with subtests.test("Check that the batch is topped up without waiting."):
+        messages = dataset.consume_batch(10, timeout=5)
+        assert [m["message"] for m in messages] == [3, 4, 5, 6]
+        assert consumer.consume_calls[-1] == {
+            "num_messages": 8,
+            "timeout": 0,
+        }
+        assert consumer.poll_calls == []
+        assert consumer.stored == {("test_dataset", 0): 7}
+
+    with subtests.test("Check that an empty consumer is polled once."):
+        assert dataset.consume_batch(10, timeout=5) == []
+        assert consumer.poll_calls == [5]
+
+
+def test_validate_message_decoding(fake_message, caplog, subtests) -> None:
+    """Tests that _validate_message decodes the message value."""
+    with subtests.test("Check that valid messages are decoded."):
+        message = fake_message(value=b'{"message": 1}')
+        assert KafkaDataset._validate_message(message) == {"message": 1}
+
+    with subtests.test("Check that invalid JSON is logged and skipped."):
+        caplog.clear()
+        message = fake_message(value=b'{"message": NaN}')
+        assert KafkaDataset._validate_message(message) is None
+        assert len(caplog.records) == 1
+
+
+def test_write_message_format(kafka_dataset) -> None:
+    """Tests that written messages decode to the full message dict."""
+    dataset = kafka_dataset("producer")
+    msg = {"int": 1, "nested": {"list": [1.5, "a", None]}}
+    dataset.write(msg)
+
+    produced = dataset._producer.produced[0]
+    assert produced["topic"] == "test_dataset"
+    value = orjson.loads(produced["value"])
+    assert value == {
+        "timestamp": value["timestamp"],
+        "dataset": "test_dataset",
+        "source_pipeline": "test_pipeline",
+        "source_node": "test_node",
+        "message": msg,
+    }
+    # Output is also valid for consumers using the standard json module
+    assert json.loads(produced["value"]) == value
+
+
+def test_write_unserializable_message(kafka_dataset) -> None:
+    """Tests that messages orjson can not encode raise KafkaDatasetError."""
+    dataset = kafka_dataset("producer")
+    with pytest.raises(KafkaDatasetError):
+        dataset.write({"int": 2**64})
+    assert dataset._producer.produced == []
+
+
+def test_build_topic_name() -> None:
+    """Tests the _build_topic_name method."""
+    build = KafkaDataset._build_topic_name
+    assert build("dataset") == "dataset"
+    assert build("dataset", pipeline_name="pipeline") == "pipeline.dataset"
+    assert build("dataset", prefix="prefix") == "prefix.dataset"
+    assert (
+        build("dataset", pipeline_name="pipeline", prefix="prefix")
+        == "prefix.pipeline.dataset"
+    )
+
+
+def test_validate_message_errors(
+    fake_message, fake_kafka_error, caplog, subtests
+) -> None:
+    """Tests that _validate_message handles consumer errors."""
+    with subtests.test("Check that missing messages are skipped."):
+        assert KafkaDataset._validate_message(None) is None
+        assert KafkaDataset._validate_message(fake_message()) is None
+
+    with subtests.test("Check that max poll errors are skipped silently."):
+        caplog.clear()
+        message = fake_message(
+            error=fake_kafka_error(KafkaError._MAX_POLL_EXCEEDED)
+        )
+        assert KafkaDataset._validate_message(message) is None
+        assert caplog.records == []
+
+    with subtests.test("Check that other errors are logged and skipped."):
+        caplog.clear()
+        message = fake_message(error=fake_kafka_error(KafkaError._TRANSPORT))
+        assert KafkaDataset._validate_message(message) is None
+        assert len(caplog.records) == 1
+
+    with subtests.test("Check that fatal errors are raised."):
+        message = fake_message(
+            error=fake_kafka_error(KafkaError._FATAL, fatal=True)
+        )
+        with pytest.raises(KafkaDatasetError):
+            KafkaDataset._validate_message(message)
+
+
+def test_write_key_encoding(kafka_dataset, subtests) -> None:
+    """Tests the encoding of message keys."""
+    dataset = kafka_dataset("producer")
+    produced = dataset._producer.produced
+    for key, expected in (
+        (None, None),
+        ("key", b"key"),
+        (b"\x00key", b"\x00key"),
+        (42, b"42"),
+    ):
+        with subtests.test(f"Check that {key!r} is encoded as {expected!r}."):
+            dataset.write({"a": 1}, key=key)
+            assert produced[-1]["key"] == expected
+
+
+def test_producer_pool(kafka_dataset, subtests) -> None:
+    """Tests that producers are shared by datasets with the same config."""
+    first = kafka_dataset("producer", name="first")
+    second = kafka_dataset("producer", name="second")
+    tuned = kafka_dataset(
+        "producer", name="tuned", params={"producer_config": {"linger.ms": 50}}
+    )
+
+    with subtests.test("Check that the same config reuses the producer."):
+        assert first._producer is second._producer
+
+    with subtests.test("Check that a different config gets its producer."):
+        assert tuned._producer is not first._producer
+        assert tuned._producer.config["linger.ms"] == 50
+
+    with subtests.test("Check that messages go to their dataset topic."):
+        first.write({"a": 1})
+        second.write({"a": 2})
+        topics = [message["topic"] for message in first._producer.produced]
+        assert topics == ["first", "second"]
+
+
+def test_close(kafka_dataset, message_factory, subtests) -> None:
+    """Tests that closed datasets rewind and release their consumer."""
+    dataset = kafka_dataset("consumer")
+    consumer = dataset._consumer
+    consumer.queue.extend(message_factory(range(5)))
+    assert dataset.read("next")["message"] == 0
+    dataset.close()
+
+    with subtests.test("Check that the consumer is rewound to unread data."):
+        assert [
+            (partition.topic, partition.partition, partition.offset)
+            for partition in consumer.seeks
+        ] == [("test_dataset", 0, 1)]
+        assert consumer.stored == {("test_dataset", 0): 1}
+        assert not dataset._buffer
+
+    with subtests.test("Check that the next dataset reuses the consumer."):
+        assert not consumer.closed
+        reused = kafka_dataset("consumer")
+        assert reused._consumer is consumer
+
+    with subtests.test("Check that a duplicate consumer is closed."):
+        duplicate = kafka_dataset("consumer")
+        assert duplicate._consumer is not consumer
+        reused.close()
+        duplicate.close()
+        assert duplicate._consumer.closed
+        assert not consumer.closed
+
+
+def test_update_offset_to_latest(
+    kafka_dataset, message_factory, caplog, subtests
+) -> None:
+    """Tests that reading the last message seeks to the latest offsets."""
+    dataset = kafka_dataset("consumer")
+    consumer = dataset._consumer
+    consumer.partitions = [
+        TopicPartition("test_dataset", partition) for partition in range(3)
+    ]
+    # Partition 1 is empty and the broker returns an error for partition 2
+    consumer.latest_offsets = {
+        ("test_dataset", 0): 5,
+        ("test_dataset", 1): -1,
+        ("test_dataset", 2): None,
+    }
+    consumer.watermarks = {
+        ("test_dataset", 0): (0, 8),
+        ("test_dataset", 1): (0, 3),
+        ("test_dataset", 2): (0, 1),
+    }
+
+    with subtests.test("Check that latest offsets are queried in one call."):
+        consumer.queue.extend(message_factory([4], start_offset=4))
+        assert dataset.read("last", timeout=1)["message"] == 4
+        assert consumer.offsets_for_times_calls == [
+            [("test_dataset", partition, OFFSET_END) for partition in range(3)]
+        ]
+        assert consumer.watermark_calls == []
+
+    with subtests.test("Check that invalid offsets are reset to -1."):
+        assert consumer.assigned == [
+            ("test_dataset", 0, 4),
+            ("test_dataset", 1, -1),
+            ("test_dataset", 2, -1),
+        ]
+        invalid_logs = [
+            record
+            for record in caplog.records
+            if "Invalid offset" in record.getMessage()
+        ]
+        assert len(invalid_logs) == 2
+
+    with subtests.test("Check that cached watermarks are used afterwards."):
+        consumer.queue.extend(message_factory([7], start_offset=7))
+        assert dataset.read("last", timeout=1)["message"] == 7
+        assert len(consumer.offsets_for_times_calls) == 1
+        assert consumer.watermark_calls == [True, True, True]
+        assert consumer.assigned == [
+            ("test_dataset", 0, 7),
+            ("test_dataset", 1, 2),
+            ("test_dataset", 2, 0),
+        ]